@@ -4,13 +4,27 @@
 #  license information.
 #  --------------------------------------------------------------------------
 """Splunk Driver class."""
+import asyncio
+import hashlib
+import io
+import json
+import logging
+import os
+import pickle  # nosec
+import tempfile
+import time
+import warnings
 from datetime import datetime
-from typing import Any, Tuple, Union, Dict, Iterable, Optional
+from functools import lru_cache, partial
+from pathlib import Path
+from typing import Any, Callable, Tuple, Union, Dict, Iterable, List, Optional
 
 import pandas as pd
+import requests
 import splunklib.client as sp_client
-import splunklib.results as sp_results
+from splunklib.binding import ResponseReader
 from splunklib.client import AuthenticationError, HTTPError
+from urllib3.exceptions import InsecureRequestWarning
 
 from .driver_base import DriverBase, QuerySource
 from ..._version import VERSION
@@ -25,6 +39,8 @@ from ...common.provider_settings import get_provider_settings, ProviderSettings
 __version__ = VERSION
 __author__ = "Ashwin Patil"
 
+_LOGGER = logging.getLogger(__name__)
+
 
 SPLUNK_CONNECT_ARGS = {
     "host": "(string) The host name (the default is 'localhost').",
@@ -47,6 +63,59 @@ SPLUNK_CONNECT_ARGS = {
     + "authenticate the Splunk instance.",
     "password": "(string) The password for the Splunk account.",
 }
+_SPLUNK_ARG_SET = frozenset(SPLUNK_CONNECT_ARGS)
+_TRUE_STRINGS = frozenset({"true", "1", "yes", "on"})
+# pd.json_normalize was only added to the top-level namespace in pandas 1.0
+_json_normalize = getattr(pd, "json_normalize", None) or pd.io.json.json_normalize
+
+
+def _coerce_bool(value: Any, default: bool = False) -> bool:
+    """Return bool value for bool or string `value`, otherwise `default`."""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        return value.strip().casefold() in _TRUE_STRINGS
+    return default
+
+
+@lru_cache(maxsize=8)
+def _parse_connection_str(connection_str: str) -> Tuple[Tuple[str, str], ...]:
+    """Return key, value pairs parsed from a Splunk connection string."""
+    cs_items = (
+        cs_item.split("=", 1) for cs_item in connection_str.split(";") if "=" in cs_item
+    )
+    return tuple((key.strip(), value) for key, value in cs_items)
+
+
+def _remove_file(file_path: Path):
+    """Delete `file_path`, ignoring files already deleted."""
+    try:
+        file_path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def _session_handler(session: requests.Session) -> Callable[..., Dict[str, Any]]:
+    """Return splunklib HTTP request handler reusing `session` connections."""
+
+    def request(url: str, message: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        del kwargs
+        response = session.request(
+            message.get("method", "GET"),
+            url,
+            headers=dict(message["headers"]),
+            data=message.get("body", ""),
+            # explicit so REQUESTS_CA_BUNDLE/CURL_CA_BUNDLE can't override it
+            verify=session.verify,
+        )
+        return {
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": list(response.raw.headers.items()),
+            "body": ResponseReader(io.BytesIO(response.content)),
+        }
+
+    return request
 
 
 @export
@@ -56,14 +125,37 @@ class SplunkDriver(DriverBase):
     _SPLUNK_REQD_ARGS = ["host", "username", "password"]
     _CONNECT_DEFAULTS: Dict[str, Any] = {"port": 8089}
     _TIME_FORMAT = '"%Y-%m-%d %H:%M:%S.%6N"'
+    _CACHE_TTL = 300
+    _POOL_SIZE = 20
+    _CATEGORICAL_COLUMNS = ("sourcetype", "host", "index", "source")
+    _CATEGORY_MIN_ROWS = 1000
+    _RESULTS_CACHE_HOME = os.path.join(
+        os.path.expanduser("~"), ".msticpy", "SplunkCache"
+    )
+    _RESULTS_CACHE_TTL = 3600
+    _RESULTS_CACHE_MAX_SIZE = 1024 * 1024 * 1024
 
     def __init__(self, **kwargs):
         """Instantiate Splunk Driver."""
         super().__init__()
         self.service = None
+        self._session: Optional[requests.Session] = None
         self._loaded = True
         self._connected = False
         self._debug = kwargs.get("debug", False)
+        self._cache_ttl = kwargs.get("cache_ttl", self._CACHE_TTL)
+        self._cache: Dict[str, Tuple[float, Any]] = {}
+        self._cache_scope = ""
+        self._use_cache = kwargs.get("use_cache", False)
+        self._results_cache = Path(
+            kwargs.get("cache_dir", self._RESULTS_CACHE_HOME)
+        ).expanduser()
+        self._results_cache_ttl = kwargs.get(
+            "results_cache_ttl", self._RESULTS_CACHE_TTL
+        )
+        self._results_cache_max_size = kwargs.get(
+            "results_cache_max_size", self._RESULTS_CACHE_MAX_SIZE
+        )
         self.public_attribs = {
             "client": self.service,
             "saved_searches": self._saved_searches,
@@ -93,11 +185,28 @@ class SplunkDriver(DriverBase):
         """
         cs_dict = self._get_connect_args(connection_str, **kwargs)
 
-        arg_dict = {
-            key: val for key, val in cs_dict.items() if key in SPLUNK_CONNECT_ARGS
-        }
+        arg_dict = {key: val for key, val in cs_dict.items() if key in _SPLUNK_ARG_SET}
+        # reuse pooled keep-alive connections for all requests to the service
+        if self._session is not None:
+            self._session.close()
+        session = self._session = requests.Session()
+        session.verify = cs_dict["verify"]
+        # like splunklib's default handler, ignore environment proxies/CA bundles
+        session.trust_env = False
+        if not session.verify:
+            # splunklib's own handler doesn't warn for unverified connections.
+            # A process-wide filter, since catch_warnings isn't thread-safe.
+            warnings.filterwarnings("ignore", category=InsecureRequestWarning)
+        session.mount(
+            "https://", requests.adapters.HTTPAdapter(pool_maxsize=self._POOL_SIZE)
+        )
+        session.mount(
+            "http://", requests.adapters.HTTPAdapter(pool_maxsize=self._POOL_SIZE)
+        )
         try:
-            self.service = sp_client.connect(**arg_dict)
+            self.service = sp_client.connect(
+                handler=_session_handler(session), **arg_dict
+            )
         except AuthenticationError as err:
             raise MsticpyConnectionError(
                 f"Authentication error connecting to Splunk: {err}",
@@ -117,35 +226,59 @@ class SplunkDriver(DriverBase):
                 help_uri="https://msticpy.readthedocs.io/en/latest/DataProviders.html",
             )
         self._connected = True
-        print("connected")
+        self._cache_scope = ":".join(
+            str(cs_dict.get(arg, "")) for arg in ("host", "port", "username", "app")
+        )
+        self.invalidate_caches()
+        _LOGGER.info("Connected to Splunk successfully")
+
+    def invalidate_caches(self, query_results: bool = False):
+        """
+        Clear cached saved searches, fired alerts and service queries.
+
+        Parameters
+        ----------
+        query_results : bool, optional
+            If True, also delete cached query results from the
+            results cache folder, by default False.
+
+        """
+        self._cache.clear()
+        if query_results and self._results_cache.is_dir():
+            for cache_file in self._results_cache.glob("*.pkl"):
+                _remove_file(cache_file)
+
+    def _cache_get(self, key: str) -> Any:
+        """Return cached value for `key` or None if missing or expired."""
+        cached = self._cache.get(key)
+        if cached and time.monotonic() - cached[0] < self._cache_ttl:
+            return cached[1]
+        return None
+
+    def _cache_set(self, key: str, value: Any) -> Any:
+        """Cache and return `value`."""
+        self._cache[key] = (time.monotonic(), value)
+        return value
 
     def _get_connect_args(
         self, connection_str: Optional[str], **kwargs
     ) -> Dict[str, Any]:
         """Check and consolidate connection parameters."""
-        cs_dict: Dict[str, Any] = self._CONNECT_DEFAULTS
+        cs_dict: Dict[str, Any] = dict(self._CONNECT_DEFAULTS)
         # Fetch any config settings
         cs_dict.update(self._get_config_settings())
         # If a connection string - parse this and add to config
         if connection_str:
-            cs_items = connection_str.split(";")
-            cs_dict.update(
-                {
-                    cs_item.split("=")[0].strip(): cs_item.split("=")[1]
-                    for cs_item in cs_items
-                }
-            )
+            cs_dict.update(_parse_connection_str(connection_str))
         elif kwargs:
             # if connection args supplied as kwargs
             cs_dict.update(kwargs)
             check_kwargs(cs_dict, list(SPLUNK_CONNECT_ARGS.keys()))
 
         cs_dict["port"] = int(cs_dict["port"])
-        verify_opt = cs_dict.get("verify")
-        if isinstance(verify_opt, str):
-            cs_dict["verify"] = "true" in verify_opt.casefold()
-        elif isinstance(verify_opt, bool):
-            cs_dict["verify"] = verify_opt
+        cs_dict["verify"] = _coerce_bool(cs_dict.get("verify"), default=False)
+        if "autologin" in cs_dict:
+            cs_dict["autologin"] = _coerce_bool(cs_dict["autologin"])
 
         missing_args = set(self._SPLUNK_REQD_ARGS) - cs_dict.keys()
         if missing_args:
@@ -177,6 +310,30 @@ class SplunkDriver(DriverBase):
         kwargs :
             Are passed to Splunk oneshot method
             count=0 by default
+        count : int, optional
+            Maximum number of rows to return, by default 0 (unlimited).
+        output_mode : str, optional
+            Splunk results format, "json" (default) or "csv".
+            Only "json" is supported with `batch`.
+        sep : str, optional
+            Separator used for column names of flattened nested
+            fields, by default ".".
+        categorical_columns : Iterable[str], optional
+            Additional result columns to convert to categorical
+            dtype (for results with at least 1000 rows).
+            "sourcetype", "host", "index" and "source" are always
+            converted.
+        batch : int, optional
+            If specified, the query is run as a search job and
+            results are retrieved in pages of `batch` rows.
+            This is recommended for queries returning large
+            numbers of results.
+        use_cache : bool, optional
+            If True, return results of an identical earlier query
+            from the local results cache, if available, and cache
+            the results of this query.
+            (the default is the `use_cache` value passed to the driver,
+            which defaults to False)
 
         Returns
         -------
@@ -188,17 +345,335 @@ class SplunkDriver(DriverBase):
         del query_source
         if not self._connected:
             raise self._create_not_connected_err()
+        cache_file = None
+        if kwargs.pop("use_cache", self._use_cache):
+            cache_file = self._results_cache_path(query, kwargs)
+            cached_df = self._read_cached_results(cache_file)
+            if cached_df is not None:
+                return cached_df
+        batch = kwargs.pop("batch", None)
+        categorical_columns = kwargs.pop("categorical_columns", None)
+        sep = kwargs.pop("sep", ".")
+        start = time.perf_counter()
+        if batch:
+            output_mode = kwargs.pop("output_mode", "json")
+            if output_mode != "json":
+                raise ValueError(
+                    f"output_mode '{output_mode}' is not supported with batch."
+                )
+            result = self._query_paged(
+                query, batch=batch, count=kwargs.pop("count", 0), sep=sep, **kwargs
+            )
+        else:
+            result = self._query_oneshot(query, sep=sep, **kwargs)
+        if self._debug:
+            _LOGGER.debug(
+                "Splunk query returned %d rows in %.3f sec",
+                len(result) if isinstance(result, pd.DataFrame) else 0,
+                time.perf_counter() - start,
+            )
+        if isinstance(result, pd.DataFrame):
+            result = self._set_result_dtypes(result, categorical_columns)
+            if cache_file:
+                try:
+                    self._write_cached_results(cache_file, result)
+                except OSError as err:
+                    _LOGGER.warning("Could not write results to cache: %s", err)
+        return result
+
+    def _query_oneshot(
+        self, query: str, sep: str = ".", **kwargs
+    ) -> Union[pd.DataFrame, Any]:
+        """Run query in OneShot search mode and return the results."""
         # default to unlimited query unless count is specified
         count = kwargs.pop("count", 0)
-        query_results = self.service.jobs.oneshot(query, count=count, **kwargs)
-        reader = sp_results.ResultsReader(query_results)
-        resp_rows = [row for row in reader if isinstance(row, dict)]
+        output_mode = kwargs.pop("output_mode", "json")
+        query_results = self.service.jobs.oneshot(
+            query, count=count, output_mode=output_mode, **kwargs
+        )
+        if output_mode == "csv":
+            return self._read_csv_results(query_results)
+        resp_rows, messages, columns = self._read_results(query_results)
         if not resp_rows:
-            print("Warning - query did not return any results.")
-            return [row for row in reader if isinstance(row, sp_results.Message)]
-        return pd.DataFrame(resp_rows)
+            _LOGGER.warning("Query did not return any results.")
+            return messages
+        return self._rows_to_df(resp_rows, columns, sep=sep)
+
+    async def query_async(
+        self, query: str, query_source: QuerySource = None, **kwargs
+    ) -> Union[pd.DataFrame, Any]:
+        """
+        Execute splunk query without blocking the event loop.
+
+        Parameters
+        ----------
+        query : str
+            Splunk query to execute
+        query_source : QuerySource
+            The query definition object
+
+        Other Parameters
+        ----------------
+        kwargs :
+            Are passed to the `query` method.
+
+        Returns
+        -------
+        Union[pd.DataFrame, Any]
+            Query results in a dataframe.
+            or query response if an error.
+
+        Notes
+        -----
+        The query is run in a worker thread so that several
+        queries can be run concurrently - for example, using
+        `asyncio.gather(*[driver.query_async(qry) for qry in queries])`.
+
+        """
+        # get_event_loop returns the running loop inside a coroutine
+        # (get_running_loop requires Python 3.7)
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            None, partial(self.query, query, query_source=query_source, **kwargs)
+        )
+
+    def stream_query(
+        self,
+        query: str,
+        on_batch: Callable[[pd.DataFrame], Any],
+        max_rows: int = 10_000,
+        max_ms: int = 250,
+        **kwargs,
+    ) -> int:
+        """
+        Run splunk query and pass events to `on_batch` as they arrive.
+
+        Parameters
+        ----------
+        query : str
+            Splunk query to execute
+        on_batch : Callable[[pd.DataFrame], Any]
+            Function called with a DataFrame of each batch of events.
+        max_rows : int, optional
+            Maximum number of events in each batch, by default 10000.
+        max_ms : int, optional
+            Maximum time in milliseconds to buffer events before
+            passing them to `on_batch`, by default 250.
+            Smaller values reduce latency, larger values reduce
+            the number of (smaller) batches.
+
+        Other Parameters
+        ----------------
+        kwargs :
+            Are passed to Splunk jobs.create method.
+
+        Returns
+        -------
+        int
+            The total number of events returned.
+
+        """
+        if not self._connected:
+            raise self._create_not_connected_err()
+        job = self.service.jobs.create(query, exec_mode="normal", **kwargs)
+        buffer: List[Dict[str, Any]] = []
+        columns: List[str] = []
+        offset = 0
+        last_flush = time.monotonic()
+        try:
+            while True:
+                done = job.is_done()
+                # only fetch what fits in the buffer so batches never exceed max_rows
+                rows, _, page_columns = self._read_results(
+                    job.events(
+                        output_mode="json",
+                        offset=offset,
+                        count=max_rows - len(buffer),
+                    )
+                )
+                offset += len(rows)
+                buffer.extend(rows)
+                columns.extend(col for col in page_columns or [] if col not in columns)
+                if buffer and (
+                    done
+                    or len(buffer) >= max_rows
+                    or (time.monotonic() - last_flush) * 1000 >= max_ms
+                ):
+                    on_batch(
+                        self._set_result_dtypes(
+                            self._rows_to_df(buffer, columns or None)
+                        )
+                    )
+                    buffer, columns = [], []
+                    last_flush = time.monotonic()
+                if done:
+                    if not rows:
+                        break
+                else:
+                    # avoid polling the REST API in a tight loop while the job runs
+                    time.sleep(max_ms / 1000)
+        finally:
+            job.cancel()
+        return offset
+
+    def _query_paged(
+        self, query: str, batch: int = 50_000, count: int = 0, sep: str = ".", **kwargs
+    ) -> Union[pd.DataFrame, Any]:
+        """Run query as a search job and retrieve up to `count` rows in pages."""
+        job = self.service.jobs.create(query, exec_mode="normal", **kwargs)
+        try:
+            # poll for job completion with exponential backoff
+            wait = 0.1
+            while not job.is_done():
+                time.sleep(wait)
+                wait = min(wait * 2, 5.0)
+
+            chunks: List[pd.DataFrame] = []
+            messages: List[Any] = []
+            offset = 0
+            # count=0 (the Splunk default) returns all results
+            while not count or offset < count:
+                page_size = min(batch, count - offset) if count else batch
+                resp_rows, page_messages, columns = self._read_results(
+                    job.results(output_mode="json", offset=offset, count=page_size)
+                )
+                messages.extend(page_messages)
+                # Splunk may return fewer rows than requested per page
+                # (limited by maxresultrows) so continue until a page is empty
+                if not resp_rows:
+                    break
+                chunks.append(self._rows_to_df(resp_rows, columns, sep=sep))
+                offset += len(resp_rows)
+        finally:
+            job.cancel()
+
+        if not chunks:
+            _LOGGER.warning("Query did not return any results.")
+            return messages
+        return pd.concat(chunks, ignore_index=True)
+
+    def _results_cache_path(self, query: str, query_args: Dict[str, Any]) -> Path:
+        """Return results cache file path for query and query arguments."""
+        key_args = sorted(
+            (name, repr(value)) for name, value in query_args.items() if name != "batch"
+        )
+        cache_key = repr((self._cache_scope, query.strip(), key_args))
+        return self._results_cache.joinpath(
+            f"{hashlib.sha256(cache_key.encode('utf-8')).hexdigest()}.pkl"
+        )
+
+    def _read_cached_results(self, cache_file: Path) -> Optional[pd.DataFrame]:
+        """Return cached results or None if missing or older than the TTL."""
+        try:
+            file_stat = cache_file.stat()
+            if time.time() - file_stat.st_mtime > self._results_cache_ttl:
+                return None
+            cached_df = pd.read_pickle(cache_file)
+            # update the access time used for LRU eviction
+            os.utime(cache_file, (time.time(), file_stat.st_mtime))
+        except (
+            OSError,
+            ValueError,
+            EOFError,
+            pickle.UnpicklingError,
+            AttributeError,
+            ImportError,
+        ):
+            # missing, corrupt or incompatible cache files are cache misses
+            return None
+        if self._debug:
+            _LOGGER.debug("Results read from cache %s", cache_file)
+        return cached_df
+
+    def _write_cached_results(self, cache_file: Path, data: pd.DataFrame):
+        """Write results to the cache and evict least recently used results."""
+        self._results_cache.mkdir(parents=True, exist_ok=True)
+        # use a unique temp file so that concurrent writers of the
+        # same results do not collide
+        temp_fd, temp_name = tempfile.mkstemp(dir=self._results_cache, suffix=".tmp")
+        os.close(temp_fd)
+        try:
+            data.to_pickle(temp_name)
+            os.replace(temp_name, cache_file)
+        finally:
+            _remove_file(Path(temp_name))
+
+        cache_files = []
+        for cached in self._results_cache.glob("*.pkl"):
+            try:
+                file_stat = cached.stat()
+            except FileNotFoundError:
+                # removed by another writer
+                continue
+            cache_files.append((file_stat.st_atime, file_stat.st_size, cached))
+        cache_files.sort()
+        cache_size = sum(file_size for _, file_size, _ in cache_files)
+        for _, file_size, cached in cache_files:
+            if cache_size <= self._results_cache_max_size:
+                break
+            _remove_file(cached)
+            cache_size -= file_size
+
+    @classmethod
+    def _set_result_dtypes(
+        cls, data: pd.DataFrame, categorical_columns: Optional[Iterable[str]] = None
+    ) -> pd.DataFrame:
+        """Convert _time to datetime and low-cardinality columns to categorical."""
+        if "_time" in data.columns:
+            data["_time"] = pd.to_datetime(
+                data["_time"], utc=True, cache=True, errors="coerce"
+            )
+        if len(data) < cls._CATEGORY_MIN_ROWS:
+            return data
+        for col in (*cls._CATEGORICAL_COLUMNS, *(categorical_columns or [])):
+            if col in data.columns:
+                data[col] = data[col].astype("category")
+        return data
 
-    def query_with_results(self, query: str, **kwargs) -> Tuple[pd.DataFrame, Any]:
+    @staticmethod
+    def _read_results(
+        query_results,
+    ) -> Tuple[List[Dict[str, Any]], List[Any], Optional[List[str]]]:
+        """Read result rows, messages and field names from a Splunk JSON response."""
+        content = query_results.read()
+        if not content.strip():
+            return [], [], None
+        response = json.loads(content)
+        columns = [
+            field["name"] if isinstance(field, dict) else field
+            for field in response.get("fields", [])
+        ]
+        return (
+            response.get("results", []),
+            response.get("messages", []),
+            columns or None,
+        )
+
+    @staticmethod
+    def _read_csv_results(query_results) -> Union[pd.DataFrame, Any]:
+        """Read Splunk CSV response into a DataFrame."""
+        try:
+            return pd.read_csv(query_results, low_memory=False)
+        except pd.errors.EmptyDataError:
+            _LOGGER.warning("Query did not return any results.")
+            return []
+
+    @staticmethod
+    def _rows_to_df(
+        resp_rows: List[Dict[str, Any]],
+        columns: Optional[List[str]] = None,
+        sep: str = ".",
+    ) -> pd.DataFrame:
+        """Return DataFrame from result rows, only flattening nested rows."""
+        # Splunk rows share the same shape so checking the first row
+        # avoids walking every value of every row.
+        if any(isinstance(val, dict) for val in resp_rows[0].values()):
+            return _json_normalize(resp_rows, sep=sep)
+        # Passing the field list reported by Splunk saves pandas from
+        # collecting the union of keys from every row.
+        return pd.DataFrame.from_records(resp_rows, columns=columns)
+
+    def query_with_results(self, query: str, **kwargs) -> Tuple[pd.DataFrame, int]:
         """
         Execute query string and return DataFrame of results.
 
@@ -207,13 +682,22 @@ class SplunkDriver(DriverBase):
         query : str
             Query to execute against splunk instance.
 
+        Other Parameters
+        ----------------
+        kwargs :
+            Are passed to the `query` method.
+
         Returns
         -------
-        Union[pd.DataFrame,Any]
-            A DataFrame (if successful) or
-            the underlying provider result if an error occurs.
+        Tuple[pd.DataFrame, int]
+            A DataFrame of results (empty if the query returned
+            no results) and the number of rows returned.
 
         """
+        result = self.query(query, **kwargs)
+        if not isinstance(result, pd.DataFrame):
+            return pd.DataFrame(), 0
+        return result, len(result)
 
     @property
     def service_queries(self) -> Tuple[Dict[str, str], str]:
@@ -229,13 +713,29 @@ class SplunkDriver(DriverBase):
         """
         if not self.connected:
             raise self._create_not_connected_err()
-        if hasattr(self.service, "saved_searches") and self.service.saved_searches:
+        queries = self._cache_get("service_queries")
+        if queries is None:
             queries = {
-                search.name.strip().replace(" ", "_"): f"search {search['search']}"
-                for search in self.service.saved_searches
+                name.strip().replace(" ", "_"): f"search {search}"
+                for name, search in self._get_saved_search_items()
             }
-            return queries, "SavedSearches"
-        return {}, "SavedSearches"
+            self._cache_set("service_queries", queries)
+        return queries, "SavedSearches"
+
+    def _get_saved_search_items(self) -> List[Tuple[str, str]]:
+        """Return (name, search) for each saved search with a single REST request."""
+        items = self._cache_get("saved_search_items")
+        if items is not None:
+            return items
+        if not hasattr(self.service, "saved_searches"):
+            return []
+        # Saved search content is returned with the collection listing,
+        # so reading "search" from each entity needs no further requests.
+        items = [
+            (savedsearch.name, savedsearch["search"])
+            for savedsearch in self.service.saved_searches
+        ]
+        return self._cache_set("saved_search_items", items)
 
     @property
     def _saved_searches(self) -> Union[pd.DataFrame, Any]:
@@ -264,19 +764,17 @@ class SplunkDriver(DriverBase):
         """
         if not self.connected:
             raise self._create_not_connected_err()
-        savedsearches = self.service.saved_searches
-
-        out_df = pd.DataFrame(columns=["name", "query"])
-
-        namelist = []
-        querylist = []
-        for savedsearch in savedsearches:
-            namelist.append(savedsearch.name.replace(" ", "_"))
-            querylist.append(savedsearch["search"])
-        out_df["name"] = namelist
-        out_df["query"] = querylist
-
-        return out_df
+        cached_df = self._cache_get("saved_searches")
+        if cached_df is not None:
+            return cached_df
+        out_df = pd.DataFrame(
+            [
+                (name.replace(" ", "_"), search)
+                for name, search in self._get_saved_search_items()
+            ],
+            columns=["name", "query"],
+        )
+        return self._cache_set("saved_searches", out_df)
 
     @property
     def _fired_alerts(self) -> Union[pd.DataFrame, Any]:
@@ -305,31 +803,54 @@ class SplunkDriver(DriverBase):
         """
         if not self.connected:
             raise self._create_not_connected_err()
-        firedalerts = self.service.fired_alerts
-
-        out_df = pd.DataFrame(columns=["name", "count"])
-
-        alert_names = []
-        alert_counts = []
-        for alert in firedalerts:
-            alert_names.append(alert.name)
-            alert_counts.append(alert.count)
-        out_df["name"] = alert_names
-        out_df["count"] = alert_counts
-
-        return out_df
+        cached_df = self._cache_get("fired_alerts")
+        if cached_df is not None:
+            return cached_df
+        out_df = pd.DataFrame(
+            [(alert.name, alert.count) for alert in self.service.fired_alerts],
+            columns=["name", "count"],
+        )
+        return self._cache_set("fired_alerts", out_df)
 
     # Parameter Formatting methods
     @staticmethod
-    def _format_datetime(date_time: datetime) -> str:
-        """Return datetime-formatted string."""
+    def _format_datetime(
+        date_time: Union[datetime, pd.Series]
+    ) -> Union[str, pd.Series]:
+        """Return datetime-formatted string or Series of strings."""
+        if isinstance(date_time, pd.Series):
+            return SplunkDriver._format_datetime_bulk(date_time)
         return f'"{date_time.isoformat(sep=" ")}"'
 
+    @staticmethod
+    def _format_datetime_bulk(date_times: pd.Series) -> pd.Series:
+        """Return Series of strings formatted as for single datetimes."""
+        formatted = date_times.dt.strftime("%Y-%m-%d %H:%M:%S")
+        # isoformat only includes microseconds if non-zero
+        microseconds = date_times.dt.microsecond
+        formatted = formatted.where(
+            microseconds == 0,
+            formatted + "." + microseconds.astype(str).str.zfill(6),
+        )
+        if date_times.dt.tz is not None:
+            # isoformat writes UTC offset as +HH:MM
+            offsets = date_times.dt.strftime("%z")
+            formatted = formatted + offsets.str[:3] + ":" + offsets.str[3:]
+        return '"' + formatted + '"'
+
     @staticmethod
     def _format_list(param_list: Iterable[Any]) -> str:
         """Return formatted list parameter."""
-        fmt_list = [f'"{item}"' for item in param_list]
-        return ",".join(fmt_list)
+        if not isinstance(param_list, (list, tuple)):
+            param_list = list(param_list)
+        if not param_list:
+            return ""
+        try:
+            # fast path - str.join needs no per-item conversion for strings
+            joined = '","'.join(param_list)
+        except TypeError:
+            joined = '","'.join(map(str, param_list))
+        return f'"{joined}"'
 
     # Read values from configuration
     @staticmethod
@@ -246,6 +246,11 @@ class QuerySource:
                 "These required parameters were not set: ", f"{missing_params.keys()}"
             )
 
+        # Resolve the parameter formatters once rather than per parameter
+        formatters = formatters or {}
+        format_datetime = formatters.get("datetime", self._format_datetime_default)
+        format_list = formatters.get("list", self._format_list_default)
+
         # Handle formatting for datetimes and cases where a format
         # template has been supplied
         for p_name, settings in self.params.items():
@@ -263,17 +268,9 @@ class QuerySource:
             elif settings["type"] == "datetime" and isinstance(
                 param_dict[p_name], datetime
             ):
-                if formatters and "datetime" in formatters:
-                    param_dict[p_name] = formatters["datetime"](param_dict[p_name])
-                else:
-                    param_dict[p_name] = self._format_datetime_default(
-                        param_dict[p_name]
-                    )
+                param_dict[p_name] = format_datetime(param_dict[p_name])
             elif settings["type"] == "list":
-                if formatters and "list" in formatters:
-                    param_dict[p_name] = formatters["list"](param_dict[p_name])
-                else:
-                    param_dict[p_name] = self._format_list_default(param_dict[p_name])
+                param_dict[p_name] = format_list(param_dict[p_name])
 
         return self._query.format(**param_dict)
 
@@ -4,13 +4,19 @@
 # license information.
 # --------------------------------------------------------------------------
 """datq query test class."""
+import asyncio
 import io
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 
 from unittest.mock import patch, MagicMock
 import pytest
 import pytest_check as check
 
 import pandas as pd
+import requests
 
 from msticpy.common.exceptions import (
     MsticpyUserConfigError,
@@ -18,14 +24,19 @@ from msticpy.common.exceptions import (
     MsticpyNotConnectedError,
 )
 
-from msticpy.data.drivers.splunk_driver import SplunkDriver, sp_client
+from msticpy.data.drivers.splunk_driver import (
+    SplunkDriver,
+    sp_client,
+    _coerce_bool,
+    _parse_connection_str,
+    _session_handler,
+)
 
 from ...unit_test_lib import get_test_data_path
 
 _TEST_DATA = get_test_data_path()
 
 SPLUNK_CLI_PATCH = SplunkDriver.__module__ + ".sp_client"
-SPLUNK_RESULTS_PATCH = SplunkDriver.__module__ + ".sp_results"
 
 
 # pylint: disable=too-many-branches, too-many-return-statements
@@ -70,18 +81,88 @@ class _MockAlert:
         self.count = count
 
 
+class _MockSplunkJob:
+    """Splunk search job mock returning 25 rows."""
+
+    def __init__(self, query, max_page=None):
+        self.query = query
+        self.max_page = max_page
+        self.cancelled = False
+
+    def is_done(self):
+        """Mock method."""
+        return True
+
+    def results(self, offset, count, **kwargs):
+        """Mock method."""
+        del kwargs
+        if self.max_page:
+            count = min(count, self.max_page)
+        rows = [
+            {"row": i, "query": self.query}
+            for i in range(offset, min(offset + count, 25))
+        ]
+        return _json_response(rows)
+
+    def events(self, offset, count, **kwargs):
+        """Mock method."""
+        return self.results(offset, count, **kwargs)
+
+    def cancel(self):
+        """Mock method."""
+        self.cancelled = True
+
+
+class _MockRunningJob(_MockSplunkJob):
+    """Splunk search job mock returning 4 more events each poll until done."""
+
+    def __init__(self, query, running_polls=3):
+        super().__init__(query)
+        self.running_polls = running_polls
+        self.polls = 0
+
+    def is_done(self):
+        """Mock method."""
+        self.polls += 1
+        return self.polls > self.running_polls
+
+    def events(self, offset, count, **kwargs):
+        """Mock method."""
+        available = 25 if self.polls > self.running_polls else self.polls * 4
+        return self.results(offset, min(count, max(available - offset, 0)), **kwargs)
+
+
+class _MockCollection(list):
+    """Splunk collection mock counting list requests."""
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.list_requests = 0
+
+    def __iter__(self):
+        """Mock method."""
+        self.list_requests += 1
+        return super().__iter__()
+
+
 class _MockSplunkService(MagicMock):
     """Splunk service mock."""
 
     def __init__(self):
         """Mock method."""
         super().__init__()
-        self.searches = [
-            _MockSplunkSearch("query1", "get stuff from somewhere"),
-            _MockSplunkSearch("query2", "get stuff from somewhere"),
-        ]
+        self.searches = _MockCollection(
+            [
+                _MockSplunkSearch("query1", "get stuff from somewhere"),
+                _MockSplunkSearch("query2", "get stuff from somewhere"),
+            ]
+        )
         self.jobs = MagicMock()
         self.jobs.oneshot = self._query_response
+        self.jobs.create = self._create_job
+        self.job_max_page = None
+        self.running_job = False
+        self.last_job = None
 
     @property
     def saved_searches(self):
@@ -100,17 +181,33 @@ class _MockSplunkService(MagicMock):
 
     @staticmethod
     def _query_response(query, **kwargs):
+        if "zero query" in query:
+            return _json_response([])
+        rows = [{"row": i, "query": query, "text": f"test text {i}"} for i in range(10)]
+        if kwargs.get("output_mode") == "csv":
+            return io.StringIO(pd.DataFrame(rows).to_csv(index=False))
+        return _json_response(rows)
+
+    def _create_job(self, query, **kwargs):
         del kwargs
-        return query
-
-
-def _results_reader(query_result):
-    """Mock Splunk results reader."""
-    if "zero query" in query_result:
-        yield None
-    else:
-        for i in range(10):
-            yield {"row": i, "query": query_result, "text": f"test text {i}"}
+        if self.running_job:
+            self.last_job = _MockRunningJob(query)
+        else:
+            self.last_job = _MockSplunkJob(query, max_page=self.job_max_page)
+        return self.last_job
+
+
+def _json_response(rows):
+    """Return mock Splunk JSON results stream."""
+    fields = [{"name": name} for name in (rows[0] if rows else [])]
+    response = {
+        "preview": False,
+        "init_offset": 0,
+        "messages": [],
+        "fields": fields,
+        "results": rows,
+    }
+    return io.BytesIO(json.dumps(response).encode("utf-8"))
 
 
 @patch(SPLUNK_CLI_PATCH)
@@ -144,6 +241,20 @@ def test_splunk_connect_req_params(splunk_client):
     sp_driver.connect(connection_str=sp_cntn_str)
 
 
+@patch(SPLUNK_CLI_PATCH)
+def test_splunk_connect_defaults_unchanged(splunk_client):
+    """Check connecting does not modify the class connection defaults."""
+    splunk_client.connect = cli_connect
+    defaults = dict(SplunkDriver._CONNECT_DEFAULTS)
+
+    sp_driver1 = SplunkDriver()
+    sp_driver1.connect(host="host1", username="ian", password="12345")  # nosec
+    sp_driver2 = SplunkDriver()
+    sp_driver2.connect(host="host2", username="ian", password="12345")  # nosec
+
+    check.equal(SplunkDriver._CONNECT_DEFAULTS, defaults)
+
+
 @patch(SPLUNK_CLI_PATCH)
 def test_splunk_connect_errors(splunk_client):
     """Check connect failure errors."""
@@ -217,14 +328,23 @@ def test_splunk_saved_searches(splunk_client):
         check.is_true(name.startswith("query"))
         check.equal(query, "search get stuff from somewhere")
 
+    # saved searches and service queries share a single list request
+    check.equal(sp_driver.service.searches.list_requests, 1)
+
+    # results are cached until the TTL expires or the cache is cleared
+    sp_driver.service.searches.append(_MockSplunkSearch("query3", "new search"))
+    check.equal(len(sp_driver._saved_searches), 2)
+    check.equal(len(sp_driver.service_queries[0]), 2)
+    sp_driver.invalidate_caches()
+    check.equal(len(sp_driver._saved_searches), 3)
+    check.equal(len(sp_driver.service_queries[0]), 3)
+
 
-@patch(SPLUNK_RESULTS_PATCH)
 @patch(SPLUNK_CLI_PATCH)
-def test_splunk_query_success(splunk_client, splunk_results):
+def test_splunk_query_success(splunk_client, caplog):
     """Check loaded true."""
     splunk_client.connect = cli_connect
     sp_driver = SplunkDriver()
-    splunk_results.ResultsReader = _results_reader
 
     # trying to get these before connecting should throw
     with pytest.raises(MsticpyNotConnectedError) as mp_ex:
@@ -242,6 +362,339 @@ def test_splunk_query_success(splunk_client, splunk_results):
     response = sp_driver.query("zero query")
     check.is_not_instance(response, pd.DataFrame)
     check.equal(len(response), 0)
+    check.is_in("Query did not return any results.", caplog.text)
+
+    df_result = sp_driver.query("some query", output_mode="csv")
+    check.is_instance(df_result, pd.DataFrame)
+    check.equal(len(df_result), 10)
+
+    df_result, row_count = sp_driver.query_with_results("some query")
+    check.is_instance(df_result, pd.DataFrame)
+    check.equal(row_count, 10)
+
+    df_result, row_count = sp_driver.query_with_results("zero query")
+    check.is_instance(df_result, pd.DataFrame)
+    check.is_true(df_result.empty)
+    check.equal(row_count, 0)
+
+
+@patch(SPLUNK_CLI_PATCH)
+def test_splunk_query_paged(splunk_client):
+    """Check query results retrieved in batches."""
+    splunk_client.connect = cli_connect
+    sp_driver = SplunkDriver()
+
+    sp_driver.connect(host="localhost", username="ian", password="12345")  # nosec
+    df_result = sp_driver.query("some query", batch=10)
+    check.is_instance(df_result, pd.DataFrame)
+    check.equal(len(df_result), 25)
+    check.equal(list(df_result["row"]), list(range(25)))
+    check.is_true(sp_driver.service.last_job.cancelled)
+
+    # pages capped by Splunk maxresultrows at fewer rows than batch
+    sp_driver.service.job_max_page = 4
+    df_result = sp_driver.query("some query", batch=10)
+    check.equal(len(df_result), 25)
+    check.equal(list(df_result["row"]), list(range(25)))
+
+    # count limits the total rows returned across pages
+    df_result = sp_driver.query("some query", batch=5, count=12)
+    check.equal(list(df_result["row"]), list(range(12)))
+
+    with pytest.raises(ValueError):
+        sp_driver.query("some query", batch=10, output_mode="csv")
+
+
+def test_splunk_rows_to_df():
+    """Check flat rows are not normalized and nested rows are flattened."""
+    flat_rows = [{"row": i, "text": f"test text {i}"} for i in range(5)]
+    check.equal(list(SplunkDriver._rows_to_df(flat_rows).columns), ["row", "text"])
+
+    # rows with missing fields are filled from the Splunk field list
+    sparse_rows = [{"row": 1}, {"row": 2, "text": "test text 2"}]
+    sparse_df = SplunkDriver._rows_to_df(sparse_rows, columns=["row", "text"])
+    check.equal(list(sparse_df.columns), ["row", "text"])
+    check.is_true(pd.isna(sparse_df["text"].iloc[0]))
+
+    nested_rows = [{"row": i, "data": {"host": f"host{i}"}} for i in range(5)]
+    nested_df = SplunkDriver._rows_to_df(nested_rows)
+    check.is_in("data.host", nested_df.columns)
+    check.equal(nested_df["data.host"].iloc[1], "host1")
+
+    nested_df = SplunkDriver._rows_to_df(nested_rows, sep="_")
+    check.is_in("data_host", nested_df.columns)
+
+
+@patch(SPLUNK_CLI_PATCH)
+def test_splunk_query_cache(splunk_client, tmp_path):
+    """Check query results are read from the results cache."""
+    splunk_client.connect = cli_connect
+    sp_driver = SplunkDriver(use_cache=True, cache_dir=str(tmp_path))
+    sp_driver.connect(host="localhost", username="ian", password="12345")  # nosec
+    sp_driver.service.jobs.oneshot = MagicMock(wraps=sp_driver.service.jobs.oneshot)
+
+    df_result = sp_driver.query("some query")
+    df_cached = sp_driver.query("some query")
+    check.equal(sp_driver.service.jobs.oneshot.call_count, 1)
+    check.is_true(df_result.equals(df_cached))
+    check.equal(len(list(tmp_path.glob("*.pkl"))), 1)
+
+    sp_driver.query("some query", use_cache=False)
+    sp_driver.query("some query", count=5)
+    check.equal(sp_driver.service.jobs.oneshot.call_count, 3)
+    check.equal(len(list(tmp_path.glob("*.pkl"))), 2)
+
+    # concurrent writers of the same results do not fail
+    cache_file = sp_driver._results_cache_path("some query", {})
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for future in [
+            executor.submit(sp_driver._write_cached_results, cache_file, df_result)
+            for _ in range(8)
+        ]:
+            future.result()
+    check.is_true(sp_driver._read_cached_results(cache_file).equals(df_result))
+    check.equal(len(list(tmp_path.glob("*.tmp"))), 0)
+
+    # corrupt cache files are treated as a cache miss
+    cache_file.write_bytes(b"not a pickle")
+    check.is_none(sp_driver._read_cached_results(cache_file))
+    check.equal(len(sp_driver.query("some query")), 10)
+
+    # failure writing to the cache still returns the results
+    with patch.object(
+        sp_driver, "_write_cached_results", side_effect=OSError("disk full")
+    ):
+        check.equal(len(sp_driver.query("new query")), 10)
+
+    sp_driver.invalidate_caches(query_results=True)
+    check.equal(len(list(tmp_path.glob("*.pkl"))), 0)
+
+    # cache exceeding max size evicts least recently used results
+    sp_driver._results_cache_max_size = 1
+    sp_driver.query("some query")
+    check.equal(len(list(tmp_path.glob("*.pkl"))), 0)
+
+
+@patch(SPLUNK_CLI_PATCH)
+def test_splunk_stream_query(splunk_client):
+    """Check streamed events are passed on in batches."""
+    splunk_client.connect = cli_connect
+    sp_driver = SplunkDriver()
+    batches = []
+
+    with pytest.raises(MsticpyNotConnectedError):
+        sp_driver.stream_query("some query", on_batch=batches.append)
+
+    sp_driver.connect(host="localhost", username="ian", password="12345")  # nosec
+    row_count = sp_driver.stream_query(
+        "some query", on_batch=batches.append, max_rows=10
+    )
+    check.equal(row_count, 25)
+    check.equal([len(batch) for batch in batches], [10, 10, 5])
+    check.equal(list(pd.concat(batches)["row"]), list(range(25)))
+    check.is_true(sp_driver.service.last_job.cancelled)
+
+
+@patch(SplunkDriver.__module__ + ".time.sleep")
+@patch(SPLUNK_CLI_PATCH)
+def test_splunk_stream_query_running(splunk_client, mock_sleep):
+    """Check events streamed from a running job are batched by time and size."""
+    splunk_client.connect = cli_connect
+    sp_driver = SplunkDriver()
+    sp_driver.connect(host="localhost", username="ian", password="12345")  # nosec
+    sp_driver.service.running_job = True
+
+    # max_ms=0 - each poll returning events is flushed as a batch
+    batches = []
+    row_count = sp_driver.stream_query(
+        "some query", on_batch=batches.append, max_rows=100, max_ms=0
+    )
+    check.equal(row_count, 25)
+    check.equal([len(batch) for batch in batches], [4, 4, 4, 13])
+    check.equal(list(pd.concat(batches)["row"]), list(range(25)))
+    # sleeps between each poll while the job is running
+    check.equal(mock_sleep.call_count, 3)
+
+    # events are buffered until the job completes
+    batches = []
+    mock_sleep.reset_mock()
+    row_count = sp_driver.stream_query(
+        "some query", on_batch=batches.append, max_rows=100, max_ms=60_000
+    )
+    check.equal(row_count, 25)
+    check.equal([len(batch) for batch in batches], [25])
+    check.equal(mock_sleep.call_count, 3)
+    mock_sleep.assert_called_with(60)
+
+    # batches are capped at max_rows when more events arrive per poll
+    batches = []
+    row_count = sp_driver.stream_query(
+        "some query", on_batch=batches.append, max_rows=3, max_ms=60_000
+    )
+    check.equal(row_count, 25)
+    check.equal([len(batch) for batch in batches], [3] * 8 + [1])
+    check.equal(list(pd.concat(batches)["row"]), list(range(25)))
+
+
+@patch(SPLUNK_CLI_PATCH)
+def test_splunk_query_async(splunk_client):
+    """Check concurrent async queries."""
+    splunk_client.connect = cli_connect
+    sp_driver = SplunkDriver()
+    sp_driver.connect(host="localhost", username="ian", password="12345")  # nosec
+
+    async def _run_queries():
+        return await asyncio.gather(
+            sp_driver.query_async("some query"),
+            sp_driver.query_async("other query", batch=10),
+            sp_driver.query_async("zero query"),
+        )
+
+    # asyncio.run needs Python 3.7
+    event_loop = asyncio.new_event_loop()
+    try:
+        results = event_loop.run_until_complete(_run_queries())
+    finally:
+        event_loop.close()
+    check.equal(len(results[0]), 10)
+    check.equal(len(results[1]), 25)
+    check.is_not_instance(results[2], pd.DataFrame)
+
+
+def test_splunk_format_list():
+    """Check list parameter formatting."""
+    check.equal(SplunkDriver._format_list(["a", "b", 1]), '"a","b","1"')
+    check.equal(SplunkDriver._format_list([""]), '""')
+    check.equal(SplunkDriver._format_list([]), "")
+
+
+def test_splunk_parse_connection_str():
+    """Check connection string parsing."""
+    cs_items = dict(_parse_connection_str("host=localhost; token=abc==;;port=8089"))
+    check.equal(cs_items, {"host": "localhost", "token": "abc==", "port": "8089"})
+
+
+def test_splunk_result_dtypes():
+    """Check result column dtype conversion."""
+    rows = [
+        {
+            "_time": "2020-08-25T10:00:00.000+00:00",
+            "host": f"host{i % 3}",
+            "EventID": str(i % 5),
+        }
+        for i in range(1000)
+    ]
+    data = SplunkDriver._set_result_dtypes(
+        pd.DataFrame(rows), categorical_columns=["EventID"]
+    )
+    check.is_true(pd.api.types.is_datetime64_any_dtype(data["_time"]))
+    check.is_instance(data["host"].dtype, pd.CategoricalDtype)
+    check.is_instance(data["EventID"].dtype, pd.CategoricalDtype)
+
+    data = SplunkDriver._set_result_dtypes(pd.DataFrame(rows[:10]))
+    check.is_true(pd.api.types.is_datetime64_any_dtype(data["_time"]))
+    check.is_not_instance(data["host"].dtype, pd.CategoricalDtype)
+
+
+def test_splunk_coerce_bool():
+    """Check bool connection parameter conversion."""
+    for value in (True, "True", " yes", "1", "on"):
+        check.is_true(_coerce_bool(value))
+    for value in (False, "false", "untrue", "0", ""):
+        check.is_false(_coerce_bool(value, default=True))
+    check.is_false(_coerce_bool(None))
+    check.is_true(_coerce_bool(None, default=True))
+
+
+def test_splunk_session_handler():
+    """Check splunklib request handler using a requests session."""
+    session = MagicMock()
+    session.verify = False
+    session.request.return_value.status_code = 200
+    session.request.return_value.reason = "OK"
+    session.request.return_value.raw.headers = {"Content-Type": "text/json"}
+    session.request.return_value.content = b'{"results": []}'
+
+    handler = _session_handler(session)
+    message = {"method": "POST", "headers": [("Authorization", "Splunk 123")]}
+    response = handler("https://localhost:8089/services/search/jobs", message)
+
+    session.request.assert_called_once_with(
+        "POST",
+        "https://localhost:8089/services/search/jobs",
+        headers={"Authorization": "Splunk 123"},
+        data="",
+        verify=False,
+    )
+    check.equal(response["status"], 200)
+    check.equal(response["reason"], "OK")
+    check.equal(response["headers"], [("Content-Type", "text/json")])
+    check.equal(response["body"].read(), b'{"results": []}')
+
+
+def test_splunk_session_handler_env_ca_bundle(tmp_path):
+    """Check verify=False is not overridden by a CA bundle env variable."""
+    ca_bundle = tmp_path.joinpath("ca.pem")
+    ca_bundle.write_text("")
+    adapter = MagicMock()
+    adapter.send.return_value.status_code = 200
+    adapter.send.return_value.reason = "OK"
+    adapter.send.return_value.raw.headers = {}
+    adapter.send.return_value.content = b""
+    adapter.send.return_value.headers = {}
+    adapter.send.return_value.is_redirect = False
+    adapter.send.return_value.history = []
+
+    session = requests.Session()
+    session.verify = False
+    session.mount("https://", adapter)
+    handler = _session_handler(session)
+    env = {"REQUESTS_CA_BUNDLE": str(ca_bundle), "CURL_CA_BUNDLE": str(ca_bundle)}
+    with patch.dict(os.environ, env):
+        handler("https://localhost:8089/services/search/jobs", {"headers": []})
+
+    check.is_false(adapter.send.call_args[1]["verify"])
+
+
+def test_splunk_connect_session():
+    """Check connect session settings and that reconnecting closes the old one."""
+    with patch(SPLUNK_CLI_PATCH) as splunk_client:
+        splunk_client.connect = cli_connect
+        sp_driver = SplunkDriver()
+        sp_driver.connect(host="localhost", username="ian", password="12345")
+        first_session = sp_driver._session
+        check.is_false(first_session.trust_env)
+        check.is_false(first_session.verify)
+
+        with patch.object(first_session, "close") as close:
+            sp_driver.connect(host="localhost", username="ian", password="12345")
+        close.assert_called_once()
+        check.is_not(sp_driver._session, first_session)
+
+
+def test_splunk_format_datetime():
+    """Check datetime parameter formatting."""
+    date_time = datetime(2020, 8, 25, 10, 1, 2, 345)
+    check.equal(
+        SplunkDriver._format_datetime(date_time), '"2020-08-25 10:01:02.000345"'
+    )
+    date_times = pd.Series([date_time, datetime(2020, 8, 25, 11)])
+    check.equal(
+        list(SplunkDriver._format_datetime(date_times)),
+        ['"2020-08-25 10:01:02.000345"', '"2020-08-25 11:00:00"'],
+    )
+
+    # Series formatting matches single values, including UTC offsets
+    tz_date_times = pd.Series(
+        [datetime(2020, 1, 15, 10), datetime(2020, 7, 15, 10, 0, 0, 500000)]
+    ).dt.tz_localize("US/Pacific")
+    check.equal(
+        list(SplunkDriver._format_datetime(tz_date_times)),
+        [
+            SplunkDriver._format_datetime(value.to_pydatetime())
+            for value in tz_date_times
+        ],
+    )
 
 
 # TODO - read config